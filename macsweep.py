@@ -5,32 +5,74 @@ A comprehensive terminal utility for finding and cleaning unnecessary files on m
 """
 
 import os
+import re
 import sys
 import argparse
 import shutil
+import stat
 import time
+import functools
+import heapq
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator, Union
 from collections import defaultdict
 import subprocess
-import mimetypes
 import threading
 import queue
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Comma-separated list of selection numbers, e.g. '1, 3,5'
+_SELECTION_RE = re.compile(r'\s*\d+(?:\s*,\s*\d+)*\s*')
+
+# Leading bytes of common formats, for Downloads files without an extension
+_MAGIC_CATEGORIES = (
+    (b'%PDF', 'documents'),
+    (b'\x89PNG', 'images'),
+    (b'\xff\xd8\xff', 'images'),
+    (b'GIF8', 'images'),
+    (b'PK\x03\x04', 'archives'),
+    (b'Rar!', 'archives'),
+    (b'7z\xbc\xaf\x27\x1c', 'archives'),
+    (b'\x1f\x8b', 'archives'),
+    (b'ID3', 'audio'),
+    (b'fLaC', 'audio'),
+    (b'OggS', 'audio'),
+    (b'\x1aE\xdf\xa3', 'videos'),
+)
+
+# Whether directories can be listed and emptied through an open descriptor
+# (os.scandir takes an fd from Python 3.7)
+_HAVE_DIR_FD = os.scandir in os.supports_fd and os.unlink in os.supports_dir_fd
+
+def _write_lines(lines: List[str]):
+    """Write buffered output lines with a single write call and clear the buffer"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        lines.clear()
 
 class ProgressBar:
     """Simple progress bar for terminal output"""
     
-    def __init__(self, total: int, description: str = "Processing"):
+    def __init__(self, total: int, description: str = "Processing", interval: float = 0.05):
         self.total = total
         self.current = 0
         self.description = description
         self.start_time = time.time()
         self.bar_width = 50
+        self.interval = interval
+        self.last_draw = 0.0
     
     def update(self, increment: int = 1):
-        """Update progress bar"""
+        """Update progress bar; redraws at most once per interval"""
         self.current += increment
+        now = time.monotonic()
+        if now - self.last_draw < self.interval and self.current < self.total:
+            return
+        self.last_draw = now
         percentage = min(100, (self.current / self.total) * 100)
         
         # Calculate bar progress
@@ -53,6 +95,134 @@ class ProgressBar:
         elapsed = time.time() - self.start_time
         print(f'\r{self.description}: [{"█" * self.bar_width}] 100.0% ({self.total}/{self.total}) Completed in {elapsed:.1f}s')
 
+class SpinnerProgress:
+    """Progress indicator for work of unknown size: running count, elapsed time and rate"""
+    
+    FRAMES = '|/-\\'
+    
+    def __init__(self, description: str = "Processing", interval: float = 0.1):
+        self.current = 0
+        self.description = description
+        self.interval = interval
+        self.start_time = time.monotonic()
+        self.last_draw = 0.0
+        self.frame = 0
+        self.line_width = 0
+    
+    def update(self, increment: int = 1):
+        """Count finished items; redraws at most once per interval"""
+        self.current += increment
+        now = time.monotonic()
+        if now - self.last_draw < self.interval:
+            return
+        self.last_draw = now
+        self.frame = (self.frame + 1) % len(self.FRAMES)
+        
+        elapsed = now - self.start_time
+        rate = self.current / elapsed if elapsed > 0 else 0
+        self._draw(f"{self.description}: {self.FRAMES[self.frame]} {self.current} files, {elapsed:.1f}s ({rate:.0f} files/s)", end='')
+    
+    def finish(self):
+        """Finish progress line"""
+        elapsed = time.monotonic() - self.start_time
+        self._draw(f"{self.description}: {self.current} files, completed in {elapsed:.1f}s")
+    
+    def _draw(self, text: str, end: str = '\n'):
+        """Overwrite the current line, blanking what a longer previous text left behind"""
+        print(f"\r{text.ljust(self.line_width)}", end=end, flush=True)
+        self.line_width = len(text)
+
+class _DirectoryTotal:
+    """Running size of a directory subtree while it is being scanned"""
+    
+    def __init__(self, parent: Optional['_DirectoryTotal'], category: Optional[str], path: str, mtime: Optional[float]):
+        self.parent = parent
+        self.category = category
+        self.path = path
+        self.mtime = mtime
+        self.size = 0
+        self.pending = 0
+    
+    def add_listing(self, size: int, subdir_count: int) -> List[Tuple[str, Tuple[str, int, float]]]:
+        """Add the size of this directory's own files and wait for its subdirectories.
+        
+        Returns (category, record) pairs for candidate directories that are now complete.
+        """
+        self.size += size
+        self.pending = subdir_count
+        if self.pending:
+            return []
+        return self._complete()
+    
+    def _complete(self) -> List[Tuple[str, Tuple[str, int, float]]]:
+        """Report finished directories and fold their sizes into their parents"""
+        records = []
+        node = self
+        while True:
+            if node.category:
+                records.append((node.category, (node.path, node.size, node.mtime)))
+            parent = node.parent
+            if parent is None:
+                return records
+            parent.size += node.size
+            parent.pending -= 1
+            if parent.pending:
+                return records
+            node = parent
+
+class CategoryBucket:
+    """Files of one cleanup category, kept as parallel path, size and mtime arrays.
+    
+    Behaves like a list of (path, size, mtime) tuples for iteration,
+    indexing and slicing, while sizes and mtimes are stored unboxed.
+    """
+    
+    __slots__ = ('paths', 'sizes', 'mtimes')
+    
+    def __init__(self):
+        self.paths = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+    
+    def append(self, entry: Tuple[str, int, float]):
+        """Add a (path, size, mtime) entry"""
+        path, size, mtime = entry
+        self.paths.append(path)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+    
+    def extend(self, other: 'CategoryBucket'):
+        """Add all entries of another bucket"""
+        self.paths.extend(other.paths)
+        self.sizes.extend(other.sizes)
+        self.mtimes.extend(other.mtimes)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def __iter__(self) -> Iterator[Tuple[str, int, float]]:
+        return zip(self.paths, self.sizes, self.mtimes)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self.paths[index], self.sizes[index], self.mtimes[index]))
+        return self.paths[index], self.sizes[index], self.mtimes[index]
+    
+    def sort(self):
+        """Order the entries by path"""
+        order = sorted(range(len(self.paths)), key=self.paths.__getitem__)
+        self.paths = [self.paths[i] for i in order]
+        self.sizes = array('q', [self.sizes[i] for i in order])
+        self.mtimes = array('d', [self.mtimes[i] for i in order])
+    
+    def total_size(self) -> int:
+        """Sum of all entry sizes"""
+        return sum(self.sizes)
+    
+    def largest(self, count: int) -> List[Tuple[str, int, float]]:
+        """The count largest entries, biggest first"""
+        return [self[i] for i in heapq.nlargest(count, range(len(self.sizes)), key=self.sizes.__getitem__)]
+
 class FileScanner:
     """Scans directories and identifies files that can be cleaned"""
     
@@ -68,156 +238,398 @@ class FileScanner:
             'browser': ['Library/Safari', 'Library/Application Support/Google/Chrome', 'Library/Application Support/Firefox']
         }
         
-        # File format categories for Downloads analysis
+        # File format categories for Downloads analysis (sets, for O(1) extension lookups)
         self.format_categories = {
-            'documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages', '.key', '.ppt', '.pptx', '.xls', '.xlsx'],
-            'images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', '.webp', '.heic', '.raw', '.cr2', '.nef'],
-            'videos': ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mkv', '.m4v', '.3gp', '.mpg', '.mpeg'],
-            'audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.aiff', '.alac'],
-            'archives': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.dmg', '.iso'],
-            'executables': ['.exe', '.app', '.dmg', '.pkg', '.deb', '.rpm', '.msi', '.bat', '.sh'],
-            'code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.swift'],
-            'data': ['.json', '.xml', '.csv', '.sql', '.db', '.sqlite', '.yaml', '.yml', '.toml', '.ini', '.conf'],
-            'fonts': ['.ttf', '.otf', '.woff', '.woff2', '.eot'],
-            'other': []  # For unknown formats
+            'documents': frozenset(['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages', '.key', '.ppt', '.pptx', '.xls', '.xlsx']),
+            'images': frozenset(['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', '.webp', '.heic', '.raw', '.cr2', '.nef']),
+            'videos': frozenset(['.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mkv', '.m4v', '.3gp', '.mpg', '.mpeg']),
+            'audio': frozenset(['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.aiff', '.alac']),
+            'archives': frozenset(['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.dmg', '.iso']),
+            'executables': frozenset(['.exe', '.app', '.dmg', '.pkg', '.deb', '.rpm', '.msi', '.bat', '.sh']),
+            'code': frozenset(['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.swift']),
+            'data': frozenset(['.json', '.xml', '.csv', '.sql', '.db', '.sqlite', '.yaml', '.yml', '.toml', '.ini', '.conf']),
+            'fonts': frozenset(['.ttf', '.otf', '.woff', '.woff2', '.eot']),
+            'other': frozenset()  # For unknown formats
         }
+        
+        # Extension -> format category; an extension listed twice ('.dmg')
+        # keeps its first category, as the in-order lookup did
+        self._ext_to_category = {}
+        for category, extensions in self.format_categories.items():
+            for ext in extensions:
+                self._ext_to_category.setdefault(ext, category)
+        
+        # An entry belongs to the first category (in declaration order) that
+        # matches its own name or the name of a directory above it. Patterns
+        # starting with '.' match names ending with them ('.log', '.git'),
+        # other patterns match the exact name ('node_modules'), and patterns
+        # with a separator match consecutive directory names. Matching
+        # ignores case, as macOS file systems usually do.
+        #
+        # Per category: one alternation over the components of a parent
+        # path (matched once per directory), and the separator patterns.
+        self._category_patterns = []
+        for category, patterns in self.file_types.items():
+            self._category_patterns.append((
+                category,
+                re.compile('(?:^|/)(?:' + '|'.join(map(self._component_regex, patterns)) + ')/', re.IGNORECASE),
+                [pattern.lower() for pattern in patterns if '/' in pattern],
+            ))
+        
+        # Entry names are matched with dict lookups instead: the lowercased
+        # name for exact patterns, and each suffix starting at a '.' for
+        # '.' patterns. Values are category ranks; the first category wins.
+        self._exact_name_ranks = {}
+        self._suffix_ranks = {}
+        for rank, patterns in enumerate(self.file_types.values()):
+            for pattern in patterns:
+                if '/' not in pattern:
+                    ranks = self._suffix_ranks if pattern.startswith('.') else self._exact_name_ranks
+                    ranks.setdefault(pattern.lower(), rank)
+        
+        # Directory reads are I/O bound, so they run on a thread pool; on
+        # APFS more than about 4 concurrent readers contend on volume locks
+        self.max_workers = 4 if sys.platform == 'darwin' else 8
+        
+        # One pool shared by every scan, including the quick scan's
+        # concurrent roots, so directory reads and open directory handles
+        # stay capped at max_workers and no scan pays for thread start-up
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+        # Modification timestamp before which files are 'old_files'; refreshed per scan
+        self._old_cutoff = (datetime.now() - timedelta(days=30)).timestamp()
+        
+        # Stay on the scanned path's filesystem unless asked otherwise, so
+        # network shares and other mounts below it are not walked
+        self.cross_device = False
+        
+        # Categories scans report; None reports every category
+        self.only_categories = None
     
-    def count_files(self, path: str, max_depth: int = 3) -> int:
-        """Count total files in directory for progress tracking"""
-        total_files = 0
+    @staticmethod
+    def _component_regex(pattern: str) -> str:
+        """Regex for the path component(s) a file_types pattern matches"""
+        if '/' in pattern:
+            return '/'.join(map(re.escape, pattern.split('/')))
+        if pattern.startswith('.'):
+            return '[^/]*' + re.escape(pattern)
+        return re.escape(pattern)
+    
+    def set_cross_device(self, cross_device: bool):
+        """Set whether scans descend into other mounted filesystems"""
+        self.cross_device = cross_device
+    
+    def category_names(self) -> List[str]:
+        """Names of every category a scan can report"""
+        return list(self.file_types) + ['large_files', 'old_files']
+    
+    def set_only_categories(self, categories: Optional[List[str]]):
+        """Limit scans to the given categories (None for all of them)"""
+        self.only_categories = frozenset(categories) if categories is not None else None
+    
+    def _root_device(self, path: str) -> Optional[int]:
+        """Device a scan of path is confined to, or None to cross mounts"""
+        if self.cross_device:
+            return None
         try:
-            for root, dirs, files in os.walk(path):
-                # Limit depth to avoid scanning too deep
-                current_depth = root.replace(path, '').count(os.sep)
-                if current_depth >= max_depth:
-                    dirs[:] = []
-                    continue
-                
-                # Skip hidden and system directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') or d in ['.cache', '.tmp', '.trash', '.Trash']]
-                total_files += len(files)
-        except PermissionError:
-            pass
-        return total_files
+            return os.stat(path).st_dev
+        except OSError:
+            return None
     
-    def scan_directory(self, path: str, max_depth: int = 3, show_progress: bool = True) -> Dict[str, List[Tuple[str, int, datetime]]]:
-        """Scan directory and categorize files for cleanup"""
-        results = defaultdict(list)
+    def scan_directory(self, path: Union[str, List[str]], max_depth: int = 3, show_progress: bool = True) -> Dict[str, CategoryBucket]:
+        """Scan a directory (or several) and categorize files for cleanup.
         
-        # Count files for progress bar
-        if show_progress:
-            print("Counting files for progress tracking...")
-            total_files = self.count_files(path, max_depth)
-            progress = ProgressBar(total_files, "Scanning files")
-        else:
-            progress = None
+        Categories come in category_names() order, each sorted by path.
+        """
+        results = defaultdict(CategoryBucket)
         
-        try:
-            for root, dirs, files in os.walk(path):
-                # Limit depth to avoid scanning too deep
-                current_depth = root.replace(path, '').count(os.sep)
-                if current_depth >= max_depth:
-                    dirs[:] = []
-                    continue
-                
-                # Skip hidden and system directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') or d in ['.cache', '.tmp', '.trash', '.Trash']]
+        # The total is not known up front; counting it would walk the tree twice
+        progress = SpinnerProgress("Scanning files") if show_progress else None
+        
+        for category, file_path, size, mtime in self.iter_scan(path, max_depth, progress):
+            results[category].append((file_path, size, mtime))
+        
+        # Finish progress bar
+        if progress:
+            progress.finish()
+        
+        # Directories finish in no fixed order, so categories are returned in
+        # declaration order and each one's entries by path
+        ordered_results = {}
+        for category in self.category_names():
+            if category in results:
+                results[category].sort()
+                ordered_results[category] = results[category]
+        return ordered_results
+    
+    def iter_scan(self, path: Union[str, List[str]], max_depth: int = 3, progress: Optional[Union[ProgressBar, SpinnerProgress]] = None) -> Iterator[Tuple[str, str, int, float]]:
+        """Scan a directory (or several) and yield (category, path, size, mtime) as entries are found.
+        
+        Several roots share one work queue, so their directories are read
+        side by side; they should not overlap.
+        """
+        self._old_cutoff = (datetime.now() - timedelta(days=30)).timestamp()
+        roots = [path] if isinstance(path, str) else list(path)
+        only = self.only_categories
+        
+        # Each worker reads one directory; new subdirectories are queued
+        # from this thread as results come back. Candidate directories are
+        # not scanned file by file, only sized: their subtrees are visited
+        # once, and a total is reported when all of its children are done.
+        finished = queue.Queue()
+        executor = self._executor
+        
+        def submit(dir_path: str, depth: int, scan: bool, total: Optional[_DirectoryTotal], root_dev: Optional[int]):
+            future = executor.submit(self._scan_single_directory, dir_path, depth, max_depth, scan, root_dev, only)
+            future.add_done_callback(finished.put)
+            totals[future] = total, root_dev
+            return future
+        
+        totals = {}
+        root_futures = {}
+        pending = 0
+        # Limit depth to avoid scanning too deep
+        if max_depth > 0:
+            for root in roots:
+                root_futures[submit(root, 0, True, None, self._root_device(root))] = root
+                pending += 1
+        while pending:
+            future = finished.get()
+            pending -= 1
+            total, root_dev = totals.pop(future)
+            try:
+                records, subdirs, file_count, dir_size = future.result()
+            except PermissionError:
+                if future in root_futures:
+                    print(f"Permission denied: {root_futures[future]}")
+                records, subdirs, file_count, dir_size = [], [], 0, 0
+            except (OSError, IOError):
+                records, subdirs, file_count, dir_size = [], [], 0, 0
+            
+            # Update progress
+            if progress and file_count:
+                progress.update(file_count)
+            
+            for subdir_path, subdir_depth, subdir_scan, category, mtime in subdirs:
+                subdir_total = None
+                if category or total is not None:
+                    subdir_total = _DirectoryTotal(total, category, subdir_path, mtime)
+                submit(subdir_path, subdir_depth, subdir_scan, subdir_total, root_dev)
+                pending += 1
+            
+            if total is not None:
+                records.extend(total.add_listing(dir_size, len(subdirs)))
+            
+            for category, (file_path, size, mtime) in records:
+                yield category, file_path, size, mtime
+    
+    def _scan_single_directory(self, dir_path: str, depth: int, max_depth: int, scan: bool,
+                               root_dev: Optional[int] = None, only: Optional[frozenset] = None) -> tuple:
+        """Read one directory level.
+        
+        Returns (records, subdirectories to visit, files seen, size of the files
+        directly inside). Subdirectories are (path, depth, scan, category, mtime)
+        tuples. Candidate directories and everything below them are only
+        visited for their size (scan=False), never categorized file by file.
+        Symlinked directories are never followed, and when root_dev is given,
+        directories on another device are skipped. When only is given, just
+        those categories are reported.
+        """
+        records = []
+        subdirs = []
+        file_count = 0
+        dir_size = 0
+        
+        # Path patterns are matched once for the whole directory
+        parent_match = self._categorize_parent(os.path.join(dir_path, '')) if scan else None
+        
+        # Without the size and age categories, a file whose name matches no
+        # selected category cannot be reported, so it is not stat'ed
+        skip_unmatched = only is not None and 'large_files' not in only and 'old_files' not in only
+        
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
                 
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        stat = os.stat(file_path)
-                        size = stat.st_size
-                        mtime = datetime.fromtimestamp(stat.st_mtime)
-                        
-                        # Categorize files
-                        category = self.categorize_file(file_path, file)
-                        if category:
-                            results[category].append((file_path, size, mtime))
-                    except (OSError, IOError):
-                        pass
+                if is_dir:
+                    if entry.is_symlink():
+                        continue
                     
-                    # Update progress
-                    if progress:
-                        progress.update()
-                
-                # Check for directories that are cleanup candidates
-                for dir_name in dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    category = self.categorize_directory(dir_path, dir_name)
+                    # Mount points of other filesystems are skipped; the
+                    # device is only checked for directories that get queued
+                    if not scan:
+                        if self._on_device(entry, root_dev):
+                            subdirs.append((entry.path, depth + 1, False, None, None))
+                        continue
+                    
+                    # Skip hidden and system directories
+                    if entry.name.startswith('.') and entry.name not in ['.cache', '.tmp', '.trash', '.Trash']:
+                        continue
+                    
+                    # Check for directories that are cleanup candidates
+                    category = self._match_child_category(parent_match, entry.name)
+                    if category and only is not None and category not in only:
+                        # An unselected candidate is not reported whole; it is
+                        # searched like any other directory when its files
+                        # can still be large or old
+                        if skip_unmatched:
+                            continue
+                        category = None
                     if category:
                         try:
-                            size = self.get_directory_size(dir_path)
-                            mtime = datetime.fromtimestamp(os.path.getmtime(dir_path))
-                            results[category].append((dir_path, size, mtime))
+                            dir_stat = entry.stat(follow_symlinks=False)
                         except (OSError, IOError):
                             continue
+                        if root_dev is not None and dir_stat.st_dev != root_dev:
+                            continue
+                        subdirs.append((entry.path, depth + 1, False, category, dir_stat.st_mtime))
+                    elif depth + 1 < max_depth and self._on_device(entry, root_dev):
+                        # Limit depth to avoid scanning too deep
+                        subdirs.append((entry.path, depth + 1, True, None, None))
+                    continue
+                
+                if scan:
+                    file_count += 1
+                    if skip_unmatched and self._match_child_category(parent_match, entry.name) not in only:
+                        continue
+                try:
+                    file_stat = entry.stat()
+                except (OSError, IOError):
+                    continue
+                size = file_stat.st_size
+                dir_size += size
+                
+                if scan:
+                    mtime = file_stat.st_mtime
+                    
+                    # Categorize files
+                    category = self._categorize_child_file(parent_match, entry.name, size, mtime, only)
+                    if category and (only is None or category in only):
+                        records.append((category, (entry.path, size, mtime)))
         
-        except PermissionError:
-            print(f"Permission denied: {path}")
-        
-        # Finish progress bar
-        if progress:
-            progress.finish()
-        
-        return results
+        return records, subdirs, file_count, dir_size
+    
+    @staticmethod
+    def _on_device(entry: os.DirEntry, root_dev: Optional[int]) -> bool:
+        """Whether a directory entry is on root_dev (always, when root_dev is None)"""
+        if root_dev is None:
+            return True
+        try:
+            return entry.stat(follow_symlinks=False).st_dev == root_dev
+        except OSError:
+            return False
+    
+    def categorize_file(self, file_path: str, filename: str, size: int, mtime: float) -> Optional[str]:
+        """Categorize a file based on its path, extension, size and modification time"""
+        return self._categorize_child_file(self._categorize_parent(file_path[:-len(filename)]), filename, size, mtime)
     
-    def categorize_file(self, file_path: str, filename: str) -> Optional[str]:
-        """Categorize a file based on its path and extension"""
-        file_lower = filename.lower()
-        path_lower = file_path.lower()
+    def _categorize_child_file(self, parent_match: Tuple[int, tuple], filename: str, size: int, mtime: float,
+                               only: Optional[frozenset] = None) -> Optional[str]:
+        """Categorize a file inside a directory already matched by _categorize_parent.
         
+        Name and path categories outside only (when given) are ignored, so
+        such files can still count as large or old.
+        """
         # Check file extensions and names
-        for category, patterns in self.file_types.items():
-            for pattern in patterns:
-                if file_lower.endswith(pattern.lower()) or pattern.lower() in path_lower:
-                    return category
+        category = self._match_child_category(parent_match, filename)
+        if category and (only is None or category in only):
+            return category
         
         # Check for large files (over 100MB)
-        try:
-            if os.path.getsize(file_path) > 100 * 1024 * 1024:
-                return 'large_files'
-        except OSError:
-            pass
+        if size > 100 * 1024 * 1024:
+            return 'large_files'
         
         # Check for old files (older than 30 days)
-        try:
-            mtime = os.path.getmtime(file_path)
-            if datetime.fromtimestamp(mtime) < datetime.now() - timedelta(days=30):
-                return 'old_files'
-        except OSError:
-            pass
+        if mtime < self._old_cutoff:
+            return 'old_files'
         
         return None
     
     def categorize_directory(self, dir_path: str, dirname: str) -> Optional[str]:
         """Categorize a directory based on its name and path"""
-        dirname_lower = dirname.lower()
-        path_lower = dir_path.lower()
-        
-        for category, patterns in self.file_types.items():
-            for pattern in patterns:
-                if dirname_lower == pattern.lower() or pattern.lower() in path_lower:
-                    return category
-        
+        return self._match_child_category(self._categorize_parent(dir_path[:-len(dirname)]), dirname)
+    
+    def _match_child_category(self, parent_match: Tuple[int, tuple], name: str) -> Optional[str]:
+        """Return the first category matching the name or a directory in the parent path"""
+        rank, continuations = parent_match
+        name_lower = name.lower()
+        
+        # Only categories ranked above the parent's own match can still win:
+        # either a separator pattern the name completes...
+        for index, remainder in continuations:
+            if index < rank and name_lower == remainder:
+                rank = index
+        
+        # ...or a pattern matching the name by itself
+        index = self._exact_name_ranks.get(name_lower, rank)
+        if index < rank:
+            rank = index
+        dot = name_lower.find('.')
+        while dot >= 0:
+            index = self._suffix_ranks.get(name_lower[dot:], rank)
+            if index < rank:
+                rank = index
+            dot = name_lower.find('.', dot + 1)
+        
+        if rank < len(self._category_patterns):
+            return self._category_patterns[rank][0]
         return None
     
-    def get_directory_size(self, path: str) -> int:
-        """Get the total size of a directory"""
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, IOError):
-                        continue
-        except (OSError, IOError):
-            pass
-        return total_size
+    def _categorize_parent(self, parent_path: str) -> Tuple[int, tuple]:
+        """Match a directory path (with trailing separator) once for all of its entries.
+        
+        Returns the rank of the first category matching a directory in the
+        path, plus (rank, remainder) pairs for multi-segment patterns such as
+        'Library/Caches' that an entry named remainder completes.
+        """
+        for rank, (category, path_regex, _) in enumerate(self._category_patterns):
+            if path_regex.search(parent_path):
+                break
+        else:
+            rank = len(self._category_patterns)
+        
+        parent_lower = '/' + parent_path.lower()
+        continuations = []
+        for index, (category, _, spanning_patterns) in enumerate(self._category_patterns[:rank]):
+            for pattern in spanning_patterns:
+                prefix, _, remainder = pattern.rpartition('/')
+                if parent_lower.endswith('/' + prefix + '/'):
+                    continuations.append((index, remainder))
+        return rank, tuple(continuations)
+    
+    @staticmethod
+    def _iter_file_entries(path: str) -> Iterator[os.DirEntry]:
+        """Yield the non-directory entries below path in os.walk order.
+        
+        Symlinked directories are not followed. Unreadable subdirectories
+        are skipped; failing to list path itself is raised.
+        """
+        stack = [path]
+        while stack:
+            dir_path = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            yield entry
+                        elif not entry.is_symlink():
+                            subdirs.append(entry.path)
+            except OSError:
+                if dir_path is path:
+                    raise
+                continue
+            # Pushed in reverse so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
     
-    def analyze_downloads_formats(self, downloads_path: str = None, show_progress: bool = True) -> Dict[str, Dict[str, List[Tuple[str, int, datetime]]]]:
+    def analyze_downloads_formats(self, downloads_path: str = None, show_progress: bool = True) -> Dict[str, Dict[str, List[Tuple[str, int, float]]]]:
         """Analyze file formats in Downloads folder and categorize them"""
         if downloads_path is None:
             downloads_path = os.path.expanduser("~/Downloads")
@@ -227,44 +639,34 @@ class FileScanner:
         
         format_analysis = defaultdict(lambda: defaultdict(list))
         
-        # Count files for progress tracking
-        if show_progress:
-            print("Counting Downloads files for progress tracking...")
-            total_files = 0
-            try:
-                for root, dirs, files in os.walk(downloads_path):
-                    total_files += len(files)
-            except PermissionError:
-                pass
-            
-            progress = ProgressBar(total_files, "Analyzing Downloads")
-        else:
-            progress = None
+        # Progress is shown without a total, so the folder is only walked once
+        progress = SpinnerProgress("Analyzing Downloads") if show_progress else None
         
         try:
-            for root, dirs, files in os.walk(downloads_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        stat = os.stat(file_path)
-                        size = stat.st_size
-                        mtime = datetime.fromtimestamp(stat.st_mtime)
-                        
-                        # Get file extension
-                        _, ext = os.path.splitext(file.lower())
-                        
-                        # Categorize by format
-                        category = self.categorize_file_format(ext, file_path)
-                        format_analysis[category][ext].append((file_path, size, mtime))
-                        
-                    except (OSError, IOError):
-                        pass
+            for entry in self._iter_file_entries(downloads_path):
+                try:
+                    file_stat = entry.stat()
+                    size = file_stat.st_size
+                    mtime = file_stat.st_mtime
+                    
+                    # Get file extension
+                    _, ext = os.path.splitext(entry.name.lower())
                     
-                    # Update progress
-                    if progress:
-                        progress.update()
+                    # Categorize by format
+                    category = self.categorize_file_format(ext, entry.path)
+                    format_analysis[category][ext].append((entry.path, size, mtime))
+                    
+                except (OSError, IOError):
+                    pass
+                
+                # Update progress
+                if progress:
+                    progress.update()
         except PermissionError:
             print(f"Permission denied: {downloads_path}")
+        except OSError:
+            # Unlistable (e.g. not a directory): nothing to analyze
+            pass
         
         # Finish progress bar
         if progress:
@@ -275,49 +677,52 @@ class FileScanner:
     def categorize_file_format(self, extension: str, file_path: str) -> str:
         """Categorize a file by its format"""
         # Check if extension matches known categories
-        for category, extensions in self.format_categories.items():
-            if extension in extensions:
-                return category
+        category = self._ext_to_category.get(extension)
+        if category:
+            return category
         
-        # Try to guess from MIME type for files without extensions
+        # Files without an extension are recognized by their first bytes
         if not extension:
+            return self._sniff_category(file_path)
+        
+        return 'other'
+    
+    @staticmethod
+    def _sniff_category(file_path: str) -> str:
+        """Guess a format category from the leading bytes of a file"""
+        try:
+            # Non-blocking, so a named pipe cannot stall the analysis
+            fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK)
             try:
-                mime_type, _ = mimetypes.guess_type(file_path)
-                if mime_type:
-                    if mime_type.startswith('image/'):
-                        return 'images'
-                    elif mime_type.startswith('video/'):
-                        return 'videos'
-                    elif mime_type.startswith('audio/'):
-                        return 'audio'
-                    elif mime_type.startswith('text/'):
-                        return 'documents'
-                    elif mime_type.startswith('application/'):
-                        if 'pdf' in mime_type:
-                            return 'documents'
-                        elif 'zip' in mime_type or 'rar' in mime_type or '7z' in mime_type:
-                            return 'archives'
-                        else:
-                            return 'other'
-            except:
-                pass
+                header = os.read(fd, 16)
+            finally:
+                os.close(fd)
+        except OSError:
+            return 'other'
         
+        for magic, category in _MAGIC_CATEGORIES:
+            if header.startswith(magic):
+                return category
+        # MP4 and QuickTime movies have 'ftyp' after a 4-byte box size
+        if header[4:8] == b'ftyp':
+            return 'videos'
         return 'other'
     
-    def collect_files_by_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]], 
-                                selected_formats: List[str]) -> List[Tuple[str, int, datetime]]:
+    def collect_files_by_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]], 
+                                selected_formats: List[str]) -> List[Tuple[str, int, float]]:
         """Collect files based on selected formats (categories or extensions)"""
         collected_files = []
+        selected = set(selected_formats)
         
         for category, extensions in format_analysis.items():
             for ext, files in extensions.items():
                 # Check if this extension or category is selected
-                if ext in selected_formats or category in selected_formats:
+                if ext in selected or category in selected:
                     collected_files.extend(files)
         
         return collected_files
     
-    def organize_downloads_files(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]], 
+    def organize_downloads_files(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]], 
                                downloads_path: str = None, show_progress: bool = True) -> Dict[str, int]:
         """Organize Downloads files into separate folders by category"""
         if downloads_path is None:
@@ -414,6 +819,11 @@ class CleanupEngine:
         self.dry_run = False
         self.verbose = False
         self.use_trash = False
+        # Removals on one APFS volume contend beyond about 4 threads
+        self.max_workers = 4 if sys.platform == 'darwin' else 8
+        # Trash destinations picked but not yet moved into, guarded by the lock
+        self._trash_lock = threading.Lock()
+        self._claimed_trash_paths = set()
     
     def set_dry_run(self, dry_run: bool):
         """Set dry run mode"""
@@ -430,80 +840,189 @@ class CleanupEngine:
     def move_to_trash(self, path: str):
         """Move a file or directory to the user's Trash"""
         trash_dir = os.path.expanduser("~/.Trash")
-        if not os.path.exists(trash_dir):
-            os.makedirs(trash_dir)
+        
+        # A free name is picked and claimed under the lock, so two files with
+        # the same name cannot land on the same destination; the move itself
+        # (a copy across volumes) runs outside it, in parallel with others
+        with self._trash_lock:
+            if not os.path.exists(trash_dir):
+                os.makedirs(trash_dir)
 
-        base_name = os.path.basename(path)
-        dest_path = os.path.join(trash_dir, base_name)
-        counter = 1
-        while os.path.exists(dest_path):
-            name, ext = os.path.splitext(base_name)
-            dest_path = os.path.join(trash_dir, f"{name}_{counter}{ext}")
-            counter += 1
+            base_name = os.path.basename(path)
+            dest_path = os.path.join(trash_dir, base_name)
+            counter = 1
+            while dest_path in self._claimed_trash_paths or os.path.exists(dest_path):
+                name, ext = os.path.splitext(base_name)
+                dest_path = os.path.join(trash_dir, f"{name}_{counter}{ext}")
+                counter += 1
+            self._claimed_trash_paths.add(dest_path)
 
-        shutil.move(path, dest_path)
+        try:
+            shutil.move(path, dest_path)
+        finally:
+            # Once moved, the destination exists and is found taken on disk
+            with self._trash_lock:
+                self._claimed_trash_paths.discard(dest_path)
     
-    def cleanup_files(self, files: List[str]) -> Tuple[int, int]:
-        """Clean up selected files and return (files_removed, bytes_freed)"""
+    def cleanup_files(self, files: List[Tuple[str, int, float]]) -> Tuple[int, int]:
+        """Clean up selected (path, size, mtime) entries and return (files_removed, bytes_freed)
+        
+        Sizes come from the scan, so directories are not walked again here.
+        """
         files_removed = 0
         bytes_freed = 0
         
-        for file_path in files:
-            try:
-                if os.path.isfile(file_path):
-                    size = os.path.getsize(file_path)
-                    if not self.dry_run:
-                        if self.use_trash:
-                            self.move_to_trash(file_path)
-                        else:
-                            os.remove(file_path)
-                    if self.verbose:
-                        action = "Moved to Trash" if self.use_trash and not self.dry_run else "Removed file"
-                        print(f"{action}: {file_path} ({self.format_size(size)})")
+        # Verbose lines are written in batches rather than one print() each
+        messages = []
+        
+        # A path selected twice must not be removed by two workers at once
+        files = list({entry[0]: entry for entry in files}.values())
+        
+        # Removals are independent syscalls, so run them side by side;
+        # map() yields results in selection order for the verbose output.
+        # Directory trees are emptied on a second pool: the entry workers
+        # wait on it, so sharing theirs could leave nothing to run the tasks.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as tree_executor:
+            remove_entry = functools.partial(self._remove_entry, tree_executor=tree_executor)
+            for removed, size, message in executor.map(remove_entry, files):
+                if message:
+                    messages.append(message)
+                    if len(messages) >= 256:
+                        _write_lines(messages)
+                if removed:
                     files_removed += 1
                     bytes_freed += size
-                elif os.path.isdir(file_path):
-                    size = self.get_directory_size(file_path)
-                    if not self.dry_run:
-                        if self.use_trash:
-                            self.move_to_trash(file_path)
-                        else:
-                            shutil.rmtree(file_path)
-                    if self.verbose:
-                        action = "Moved to Trash" if self.use_trash and not self.dry_run else "Removed directory"
-                        print(f"{action}: {file_path} ({self.format_size(size)})")
-                    files_removed += 1
-                    bytes_freed += size
-            except (OSError, IOError) as e:
-                if self.verbose:
-                    print(f"Error removing {file_path}: {e}")
-                continue
         
+        _write_lines(messages)
+        sys.stdout.flush()
         return files_removed, bytes_freed
     
-    def get_directory_size(self, path: str) -> int:
-        """Get the total size of a directory"""
-        total_size = 0
+    def _remove_entry(self, entry: Tuple[str, int, float], tree_executor: ThreadPoolExecutor) -> Tuple[bool, int, Optional[str]]:
+        """Remove a single entry and return (removed, size, verbose message)"""
+        file_path, size, _ = entry
         try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, IOError):
-                        continue
-        except (OSError, IOError):
-            pass
-        return total_size
+            # One lstat decides how to remove the entry; symlinks are removed
+            # themselves, never their targets
+            try:
+                mode = os.lstat(file_path).st_mode
+            except FileNotFoundError:
+                return False, 0, None
+            if stat.S_ISREG(mode) or stat.S_ISLNK(mode):
+                if not self.dry_run:
+                    if self.use_trash:
+                        self.move_to_trash(file_path)
+                    else:
+                        os.remove(file_path)
+                action = "Moved to Trash" if self.use_trash and not self.dry_run else "Removed file"
+            elif stat.S_ISDIR(mode):
+                if not self.dry_run:
+                    if self.use_trash:
+                        self.move_to_trash(file_path)
+                    else:
+                        self._delete_tree(file_path, tree_executor)
+                action = "Moved to Trash" if self.use_trash and not self.dry_run else "Removed directory"
+            else:
+                return False, 0, None
+        except (OSError, IOError) as e:
+            return False, 0, f"Error removing {file_path}: {e}" if self.verbose else None
+        
+        return True, size, f"{action}: {file_path} ({self.format_size(size)})" if self.verbose else None
+    
+    def _delete_tree(self, path: str, executor: ThreadPoolExecutor):
+        """Delete a directory tree, emptying its directories in parallel.
+        
+        path must be a real directory, not a symlink to one. Each directory
+        is listed once on the executor, which unlinks its files and hands back
+        its subdirectories to queue from this thread; the emptied directories
+        are then removed deepest first. Symlinks inside are removed, never
+        followed. Entries that disappear meanwhile count as removed; like
+        shutil.rmtree, the first other failure is raised.
+        """
+        finished = queue.Queue()
+        
+        def submit(dir_path: str):
+            executor.submit(self._unlink_directory_files, dir_path).add_done_callback(finished.put)
+        
+        directories = []
+        error = None
+        submit(path)
+        pending = 1
+        while pending:
+            future = finished.get()
+            pending -= 1
+            try:
+                dir_path, subdirs = future.result()
+            except OSError as e:
+                # Stop queueing work, but let the directories in flight finish
+                if error is None:
+                    error = e
+                continue
+            directories.append(dir_path)
+            if error is None:
+                for subdir in subdirs:
+                    submit(subdir)
+                    pending += 1
+        
+        if error is not None:
+            raise error
+        
+        # Every directory is listed after its parent
+        for dir_path in reversed(directories):
+            try:
+                os.rmdir(dir_path)
+            except FileNotFoundError:
+                pass
+    
+    @staticmethod
+    def _unlink_directory_files(dir_path: str) -> Tuple[str, List[str]]:
+        """Unlink everything but subdirectories in dir_path; returns (dir_path, subdirectories)
+        
+        Entries (or dir_path itself) that are already gone are skipped.
+        """
+        subdirs = []
+        if not _HAVE_DIR_FD:
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            try:
+                                os.unlink(entry.path)
+                            except FileNotFoundError:
+                                pass
+            except FileNotFoundError:
+                pass
+            return dir_path, subdirs
+        
+        # Resolve dir_path once and unlink by name relative to it, instead of
+        # walking the full path again for every file
+        try:
+            fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW)
+        except FileNotFoundError:
+            return dir_path, subdirs
+        base = os.path.join(dir_path, '')
+        try:
+            with os.scandir(fd) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(base + entry.name)
+                    else:
+                        try:
+                            os.unlink(entry.name, dir_fd=fd)
+                        except FileNotFoundError:
+                            pass
+        finally:
+            os.close(fd)
+        return dir_path, subdirs
     
     @staticmethod
     def format_size(size: int) -> str:
         """Format size in human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        # Each unit is 2**10 of the previous one, so the bit length picks it
+        unit = min((int(size).bit_length() - 1) // 10, 4) if size > 0 else 0
+        return f"{size / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"
 
 class TerminalUI:
     """Interactive terminal user interface"""
@@ -511,11 +1030,26 @@ class TerminalUI:
     def __init__(self):
         self.cleanup_engine = CleanupEngine()
     
-    def display_categories(self, scan_results: Dict[str, List[Tuple[str, int, datetime]]]):
+    @staticmethod
+    def _parse_selection(choice: str, count: int) -> Optional[List[int]]:
+        """Parse comma-separated 1-based numbers into indices, or print why not and return None.
+        
+        Repeated numbers are dropped; the indices keep their input order.
+        """
+        if not _SELECTION_RE.fullmatch(choice):
+            print(f"Invalid input: {choice}")
+            return None
+        
+        indices = list(dict.fromkeys(int(number) - 1 for number in re.findall(r'\d+', choice)))
+        for idx in indices:
+            if not 0 <= idx < count:
+                print(f"Invalid selection: {idx + 1}")
+                return None
+        return indices
+    
+    def display_categories(self, scan_results: Dict[str, CategoryBucket]):
         """Display cleanup categories with file counts and sizes"""
-        print("\n" + "="*60)
-        print("CLEANUP SUGGESTIONS")
-        print("="*60)
+        lines = ["\n" + "="*60, "CLEANUP SUGGESTIONS", "="*60]
         
         total_files = 0
         total_size = 0
@@ -524,25 +1058,26 @@ class TerminalUI:
             if not files:
                 continue
             
-            category_size = sum(size for _, size, _ in files)
+            category_size = files.total_size()
             total_files += len(files)
             total_size += category_size
             
-            print(f"\n{category.upper().replace('_', ' ')}:")
-            print(f"  Files: {len(files)}")
-            print(f"  Size: {self.cleanup_engine.format_size(category_size)}")
+            lines.append(f"\n{category.upper().replace('_', ' ')}:")
+            lines.append(f"  Files: {len(files)}")
+            lines.append(f"  Size: {self.cleanup_engine.format_size(category_size)}")
             
-            # Show a few example files
-            for i, (path, size, mtime) in enumerate(files[:3]):
-                print(f"    • {os.path.basename(path)} ({self.cleanup_engine.format_size(size)})")
+            # Show the largest files as examples
+            for path, size, mtime in files.largest(3):
+                lines.append(f"    • {os.path.basename(path)} ({self.cleanup_engine.format_size(size)})")
             
             if len(files) > 3:
-                print(f"    ... and {len(files) - 3} more files")
+                lines.append(f"    ... and {len(files) - 3} more files")
         
-        print(f"\nTOTAL: {total_files} files, {self.cleanup_engine.format_size(total_size)}")
+        lines.append(f"\nTOTAL: {total_files} files, {self.cleanup_engine.format_size(total_size)}")
+        _write_lines(lines)
         return total_files, total_size
     
-    def select_categories(self, scan_results: Dict[str, List[Tuple[str, int, datetime]]]) -> List[str]:
+    def select_categories(self, scan_results: Dict[str, CategoryBucket]) -> List[str]:
         """Interactive category selection"""
         print("\n" + "="*60)
         print("SELECT CATEGORIES TO CLEAN")
@@ -557,7 +1092,7 @@ class TerminalUI:
         print("\nAvailable categories:")
         for i, category in enumerate(categories, 1):
             file_count = len(scan_results[category])
-            total_size = sum(size for _, size, _ in scan_results[category])
+            total_size = scan_results[category].total_size()
             print(f"{i}. {category.replace('_', ' ').title()} ({file_count} files, {self.cleanup_engine.format_size(total_size)})")
         
         print(f"\nOptions:")
@@ -581,21 +1116,8 @@ class TerminalUI:
                     continue
                 
                 # Parse comma-separated numbers
-                selected_indices = []
-                for part in choice.split(','):
-                    part = part.strip()
-                    if part.isdigit():
-                        idx = int(part) - 1
-                        if 0 <= idx < len(categories):
-                            selected_indices.append(idx)
-                        else:
-                            print(f"Invalid selection: {part}")
-                            break
-                    else:
-                        print(f"Invalid input: {part}")
-                        break
-                else:
-                    # All parts were valid
+                selected_indices = self._parse_selection(choice, len(categories))
+                if selected_indices is not None:
                     return [categories[i] for i in selected_indices]
                 
             except KeyboardInterrupt:
@@ -605,11 +1127,9 @@ class TerminalUI:
                 print("\nOperation cancelled.")
                 return []
     
-    def list_category_files(self, scan_results: Dict[str, List[Tuple[str, int, datetime]]], categories: List[str]):
+    def list_category_files(self, scan_results: Dict[str, CategoryBucket], categories: List[str]):
         """List files in each category for user review"""
-        print("\n" + "="*80)
-        print("📁 FILES IN EACH CATEGORY")
-        print("="*80)
+        lines = ["\n" + "="*80, "📁 FILES IN EACH CATEGORY", "="*80]
         
         for i, category in enumerate(categories, 1):
             if category not in scan_results or not scan_results[category]:
@@ -617,34 +1137,35 @@ class TerminalUI:
                 
             files = scan_results[category]
             file_count = len(files)
-            total_size = sum(size for _, size, _ in files)
+            total_size = files.total_size()
             
-            print(f"\n{i}. {category.replace('_', ' ').title()} ({file_count} files, {self.cleanup_engine.format_size(total_size)})")
-            print("-" * 60)
+            lines.append(f"\n{i}. {category.replace('_', ' ').title()} ({file_count} files, {self.cleanup_engine.format_size(total_size)})")
+            lines.append("-" * 60)
             
             # Show sample files (first 5 and last 2 if more than 7)
             if file_count <= 7:
                 for file_path, size, mtime in files:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
             else:
                 # Show first 5
                 for file_path, size, mtime in files[:5]:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
                 
-                print(f"   • ... and {file_count - 7} more files ...")
+                lines.append(f"   • ... and {file_count - 7} more files ...")
                 
                 # Show last 2
                 for file_path, size, mtime in files[-2:]:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(size)})")
         
-        print("\n" + "="*80)
-        print("💡 Tip: Use the numbers above to select categories for cleanup")
-        print("="*80)
+        lines.append("\n" + "="*80)
+        lines.append("💡 Tip: Use the numbers above to select categories for cleanup")
+        lines.append("="*80)
+        _write_lines(lines)
     
-    def confirm_cleanup(self, selected_files: List[str], total_size: int) -> bool:
+    def confirm_cleanup(self, selected_files: List[Tuple[str, int, float]], total_size: int) -> bool:
         """Confirm cleanup operation"""
         print(f"\n{'='*60}")
         print("CONFIRM CLEANUP")
@@ -654,7 +1175,7 @@ class TerminalUI:
         print(f"Total size: {self.cleanup_engine.format_size(total_size)}")
         
         print("\nSample files:")
-        for i, file_path in enumerate(selected_files[:10]):
+        for file_path, _, _ in selected_files[:10]:
             print(f"  • {file_path}")
         
         if len(selected_files) > 10:
@@ -678,27 +1199,28 @@ class TerminalUI:
                 print("\nOperation cancelled.")
                 return False
     
-    def display_downloads_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]]):
+    def display_downloads_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]]):
         """Display Downloads folder format analysis"""
-        print("\n" + "="*80)
-        print("📁 DOWNLOADS FOLDER FORMAT ANALYSIS")
-        print("="*80)
+        lines = ["\n" + "="*80, "📁 DOWNLOADS FOLDER FORMAT ANALYSIS", "="*80]
         
         if not format_analysis:
-            print("No files found in Downloads folder.")
+            lines.append("No files found in Downloads folder.")
+            _write_lines(lines)
             return
         
         total_files = 0
         total_size = 0
+        format_size = self.cleanup_engine.format_size
+        
+        # Sum each extension once; the totals are reused for sorting and display
+        ext_sizes = {}
         
         # Sort categories by total size
         category_sizes = {}
         for category, extensions in format_analysis.items():
-            category_size = 0
-            category_files = 0
-            for ext, files in extensions.items():
-                category_size += sum(size for _, size, _ in files)
-                category_files += len(files)
+            sizes = ext_sizes[category] = {ext: sum(size for _, size, _ in files) for ext, files in extensions.items()}
+            category_size = sum(sizes.values())
+            category_files = sum(len(files) for files in extensions.values())
             category_sizes[category] = (category_size, category_files)
             total_size += category_size
             total_files += category_files
@@ -710,44 +1232,46 @@ class TerminalUI:
             if category_files == 0:
                 continue
                 
-            print(f"\n📂 {category.upper().replace('_', ' ')}:")
-            print(f"   Total: {category_files} files, {self.cleanup_engine.format_size(category_size)}")
-            print("   " + "-" * 60)
+            lines.append(f"\n📂 {category.upper().replace('_', ' ')}:")
+            lines.append(f"   Total: {category_files} files, {format_size(category_size)}")
+            lines.append("   " + "-" * 60)
             
             # Get all extensions for this category
             extensions = format_analysis[category]
+            sizes = ext_sizes[category]
             sorted_extensions = sorted(extensions.items(), 
-                                     key=lambda x: sum(size for _, size, _ in x[1]), 
+                                     key=lambda x: sizes[x[0]], 
                                      reverse=True)
             
             for ext, files in sorted_extensions:
                 if not files:
                     continue
                     
-                ext_size = sum(size for _, size, _ in files)
+                ext_size = sizes[ext]
                 ext_count = len(files)
                 
-                print(f"   {ext:>8} | {ext_count:>4} files | {self.cleanup_engine.format_size(ext_size):>10}")
+                lines.append(f"   {ext:>8} | {ext_count:>4} files | {format_size(ext_size):>10}")
                 
                 # Show sample files for this extension
                 if ext_count <= 3:
                     for file_path, size, mtime in files:
                         filename = os.path.basename(file_path)
-                        print(f"           • {filename} ({self.cleanup_engine.format_size(size)})")
+                        lines.append(f"           • {filename} ({format_size(size)})")
                 else:
                     # Show first 2 and last 1
                     for file_path, size, mtime in files[:2]:
                         filename = os.path.basename(file_path)
-                        print(f"           • {filename} ({self.cleanup_engine.format_size(size)})")
-                    print(f"           • ... and {ext_count - 3} more files")
+                        lines.append(f"           • {filename} ({format_size(size)})")
+                    lines.append(f"           • ... and {ext_count - 3} more files")
                     if files:
                         last_file = files[-1]
                         filename = os.path.basename(last_file[0])
-                        print(f"           • {filename} ({self.cleanup_engine.format_size(last_file[1])})")
+                        lines.append(f"           • {filename} ({format_size(last_file[1])})")
         
-        print(f"\n" + "="*80)
-        print(f"📊 SUMMARY: {total_files} files, {self.cleanup_engine.format_size(total_size)} total")
-        print("="*80)
+        lines.append(f"\n" + "="*80)
+        lines.append(f"📊 SUMMARY: {total_files} files, {format_size(total_size)} total")
+        lines.append("="*80)
+        _write_lines(lines)
     
     def display_organization_results(self, organized_stats: Dict[str, int]):
         """Display Downloads organization results"""
@@ -803,7 +1327,7 @@ class TerminalUI:
             if organized_stats.get(category, 0) > 0:
                 print(f"  📁 {folder_name}/ - {organized_stats[category]} files")
     
-    def select_downloads_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]]) -> List[str]:
+    def select_downloads_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]]) -> List[str]:
         """Interactive Downloads format selection for cleanup"""
         print("\n" + "="*80)
         print("🗑️  SELECT DOWNLOADS FORMATS TO CLEAN")
@@ -856,21 +1380,8 @@ class TerminalUI:
                     return self.select_specific_formats(format_analysis)
                 
                 # Parse comma-separated numbers
-                selected_indices = []
-                for part in choice.split(','):
-                    part = part.strip()
-                    if part.isdigit():
-                        idx = int(part) - 1
-                        if 0 <= idx < len(sorted_categories):
-                            selected_indices.append(idx)
-                        else:
-                            print(f"Invalid selection: {part}")
-                            break
-                    else:
-                        print(f"Invalid input: {part}")
-                        break
-                else:
-                    # All parts were valid
+                selected_indices = self._parse_selection(choice, len(sorted_categories))
+                if selected_indices is not None:
                     return [sorted_categories[i][0] for i in selected_indices]
                 
             except KeyboardInterrupt:
@@ -880,42 +1391,41 @@ class TerminalUI:
                 print("\nOperation cancelled.")
                 return []
     
-    def list_downloads_category_files(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]], sorted_categories: List[Tuple[str, Tuple[List[Tuple[str, int, datetime]], int]]]):
+    def list_downloads_category_files(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]], sorted_categories: List[Tuple[str, Tuple[List[Tuple[str, int, float]], int]]]):
         """List files in each Downloads category for user review"""
-        print("\n" + "="*80)
-        print("📁 DOWNLOADS FILES IN EACH CATEGORY")
-        print("="*80)
+        lines = ["\n" + "="*80, "📁 DOWNLOADS FILES IN EACH CATEGORY", "="*80]
         
         for i, (category, (files, size)) in enumerate(sorted_categories, 1):
             if not files:
                 continue
                 
-            print(f"\n{i}. {category.upper().replace('_', ' ')} ({len(files)} files, {self.cleanup_engine.format_size(size)})")
-            print("-" * 60)
+            lines.append(f"\n{i}. {category.upper().replace('_', ' ')} ({len(files)} files, {self.cleanup_engine.format_size(size)})")
+            lines.append("-" * 60)
             
             # Show sample files (first 5 and last 2 if more than 7)
             if len(files) <= 7:
                 for file_path, file_size, mtime in files:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
             else:
                 # Show first 5
                 for file_path, file_size, mtime in files[:5]:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
                 
-                print(f"   • ... and {len(files) - 7} more files ...")
+                lines.append(f"   • ... and {len(files) - 7} more files ...")
                 
                 # Show last 2
                 for file_path, file_size, mtime in files[-2:]:
                     filename = os.path.basename(file_path)
-                    print(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
+                    lines.append(f"   • {filename} ({self.cleanup_engine.format_size(file_size)})")
         
-        print("\n" + "="*80)
-        print("💡 Tip: Use the numbers above to select categories for cleanup")
-        print("="*80)
+        lines.append("\n" + "="*80)
+        lines.append("💡 Tip: Use the numbers above to select categories for cleanup")
+        lines.append("="*80)
+        _write_lines(lines)
     
-    def select_specific_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, datetime]]]]) -> List[str]:
+    def select_specific_formats(self, format_analysis: Dict[str, Dict[str, List[Tuple[str, int, float]]]]) -> List[str]:
         """Select specific file extensions for cleanup"""
         print("\n" + "="*80)
         print("📁 SELECT SPECIFIC FILE EXTENSIONS")
@@ -966,21 +1476,8 @@ class TerminalUI:
                         continue
                 
                 # Parse comma-separated numbers
-                selected_indices = []
-                for part in choice.split(','):
-                    part = part.strip()
-                    if part.isdigit():
-                        idx = int(part) - 1
-                        if 0 <= idx < len(all_extensions):
-                            selected_indices.append(idx)
-                        else:
-                            print(f"Invalid selection: {part}")
-                            break
-                    else:
-                        print(f"Invalid input: {part}")
-                        break
-                else:
-                    # All parts were valid
+                selected_indices = self._parse_selection(choice, len(all_extensions))
+                if selected_indices is not None:
                     return [all_extensions[i][0] for i in selected_indices]
                 
             except KeyboardInterrupt:
@@ -992,8 +1489,10 @@ class TerminalUI:
 
 def main():
     """Main application entry point"""
+    home = os.path.expanduser("~")
+    
     parser = argparse.ArgumentParser(description="MacSweep - The Ultimate macOS File Cleanup Wizard")
-    parser.add_argument("path", nargs="?", default=os.path.expanduser("~"), 
+    parser.add_argument("path", nargs="?", default=home, 
                        help="Path to scan (default: home directory)")
     parser.add_argument("--dry-run", action="store_true", 
                        help="Show what would be deleted without actually deleting")
@@ -1013,18 +1512,39 @@ def main():
                        help="Organize Downloads files into separate folders by category")
     parser.add_argument("--no-progress", action="store_true",
                        help="Disable progress bars for minimal output")
+    parser.add_argument("--cross-device", action="store_true",
+                       help="Also scan other filesystems mounted below the path")
+    parser.add_argument("--only", metavar="CATEGORIES",
+                       help="Only look for these comma-separated categories (e.g. cache,logs); "
+                            "folders of other categories are searched only for large_files and old_files")
     
     args = parser.parse_args()
     
-    # Validate path
-    if not os.path.exists(args.path):
+    # Validate path with a single stat
+    try:
+        path_mode = os.stat(args.path).st_mode
+    except OSError:
         print(f"Error: Path '{args.path}' does not exist.")
         sys.exit(1)
     
-    if not os.path.isdir(args.path):
+    if not stat.S_ISDIR(path_mode):
         print(f"Error: Path '{args.path}' is not a directory.")
         sys.exit(1)
     
+    scanner = FileScanner()
+    scanner.set_cross_device(args.cross_device)
+    if args.only is not None:
+        only = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in only if name not in scanner.category_names()]
+        if not only or unknown:
+            if unknown:
+                print(f"Error: Unknown categories: {', '.join(unknown)}")
+            else:
+                print("Error: --only needs at least one category.")
+            print(f"Available categories: {', '.join(scanner.category_names())}")
+            sys.exit(1)
+        scanner.set_only_categories(only)
+    
     print("🧹 MacSweep - The Ultimate macOS File Cleanup Wizard")
     print("="*60)
     print(f"Scanning: {args.path}")
@@ -1034,7 +1554,6 @@ def main():
         print("🔍 DRY RUN MODE - No files will be deleted")
     
     # Initialize components
-    scanner = FileScanner()
     ui = TerminalUI()
     ui.cleanup_engine.set_dry_run(args.dry_run)
     ui.cleanup_engine.set_verbose(args.verbose)
@@ -1086,18 +1605,17 @@ def main():
             print("No files found matching your selection.")
             return
         
-        # Convert to file paths and calculate total size
-        file_paths = [file_path for file_path, _, _ in selected_files]
+        # Calculate total size
         total_size = sum(size for _, size, _ in selected_files)
         
-        print(f"\nSelected {len(file_paths)} files ({ui.cleanup_engine.format_size(total_size)}) for cleanup")
+        print(f"\nSelected {len(selected_files)} files ({ui.cleanup_engine.format_size(total_size)}) for cleanup")
         
         # Confirm and execute cleanup
-        if ui.confirm_cleanup(file_paths, total_size):
+        if ui.confirm_cleanup(selected_files, total_size):
             print("\n🧹 Starting Downloads cleanup...")
             start_time = time.time()
             
-            files_removed, bytes_freed = ui.cleanup_engine.cleanup_files(file_paths)
+            files_removed, bytes_freed = ui.cleanup_engine.cleanup_files(selected_files)
             
             cleanup_time = time.time() - start_time
             print(f"\n✅ Downloads cleanup completed in {cleanup_time:.2f} seconds")
@@ -1185,19 +1703,26 @@ def main():
     if args.quick:
         # Quick scan - common cleanup locations
         common_paths = [
-            os.path.expanduser("~/Library/Caches"),
-            os.path.expanduser("~/Library/Logs"),
-            os.path.expanduser("~/Downloads"),
-            os.path.expanduser("~/.cache"),
-            os.path.expanduser("~/.tmp")
+            os.path.join(home, "Library", "Caches"),
+            os.path.join(home, "Library", "Logs"),
+            os.path.join(home, "Downloads"),
+            os.path.join(home, ".cache"),
+            os.path.join(home, ".tmp")
         ]
         
-        scan_results = defaultdict(list)
-        for path in common_paths:
-            if os.path.exists(path):
-                results = scanner.scan_directory(path, args.depth, show_progress=not args.no_progress)
-                for category, files in results.items():
-                    scan_results[category].extend(files)
+        # Drop roots that resolve to a place inside another root, so that no
+        # directory is scanned (and no file reported) twice. The roots are
+        # still scanned by their own path: categories match its names.
+        quick_roots = []
+        resolved_roots = []
+        for real_path, path in sorted((os.path.realpath(p), p) for p in common_paths if os.path.exists(p)):
+            if not any(real_path == root or real_path.startswith(os.path.join(root, '')) for root in resolved_roots):
+                resolved_roots.append(real_path)
+                quick_roots.append(path)
+        
+        # The roots are independent subtrees, so one scan reads them all
+        # side by side on the scanner's pool
+        scan_results = scanner.scan_directory(quick_roots, args.depth, show_progress=not args.no_progress)
     else:
         scan_results = scanner.scan_directory(args.path, args.depth, show_progress=not args.no_progress)
     
@@ -1224,9 +1749,8 @@ def main():
     selected_size = 0
     
     for category in selected_categories:
-        for file_path, size, mtime in scan_results[category]:
-            selected_files.append(file_path)
-            selected_size += size
+        selected_files.extend(scan_results[category])
+        selected_size += scan_results[category].total_size()
     
     # Confirm and execute cleanup
     if ui.confirm_cleanup(selected_files, selected_size):
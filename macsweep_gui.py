@@ -2,6 +2,8 @@
 """Simple Tkinter GUI for MacSweep"""
 
 import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
@@ -16,6 +18,8 @@ class MacSweepGUI:
         self.engine = CleanupEngine()
         self.scan_results = {}
         self.category_order = []
+        # Results of background work come back to the main thread through this queue
+        self.task_queue = queue.Queue()
 
         self.create_widgets()
 
@@ -41,19 +45,22 @@ class MacSweepGUI:
         dry_check = ttk.Checkbutton(frame, text="Dry run", variable=self.dry_var)
         dry_check.grid(row=1, column=2, sticky=tk.W)
 
-        scan_btn = ttk.Button(frame, text="Scan", command=self.scan)
-        scan_btn.grid(row=2, column=0, pady=5, sticky=tk.W)
+        self.scan_btn = ttk.Button(frame, text="Scan", command=self.scan)
+        self.scan_btn.grid(row=2, column=0, pady=5, sticky=tk.W)
 
         self.listbox = tk.Listbox(frame, selectmode=tk.MULTIPLE, width=50, height=10)
         self.listbox.grid(row=3, column=0, columnspan=3, pady=5, sticky=tk.W+tk.E)
 
-        clean_btn = ttk.Button(frame, text="Clean Selected", command=self.clean)
-        clean_btn.grid(row=4, column=0, pady=5, sticky=tk.W)
+        self.clean_btn = ttk.Button(frame, text="Clean Selected", command=self.clean)
+        self.clean_btn.grid(row=4, column=0, pady=5, sticky=tk.W)
 
         self.status_var = tk.StringVar()
         status_label = ttk.Label(frame, textvariable=self.status_var)
         status_label.grid(row=5, column=0, columnspan=3, sticky=tk.W)
 
+        self.busy_bar = ttk.Progressbar(frame, mode="indeterminate")
+        self.busy_bar.grid(row=6, column=0, columnspan=3, sticky=tk.W+tk.E)
+
     def browse_path(self):
         path = filedialog.askdirectory(initialdir=self.path_var.get())
         if path:
@@ -66,19 +73,61 @@ class MacSweepGUI:
             return
 
         self.status_var.set("Scanning...")
-        self.root.update()
-        self.scan_results = self.scanner.scan_directory(path, self.depth_var.get(), show_progress=False)
+        depth = self.depth_var.get()
+        self._run_in_background(
+            lambda: self.scanner.scan_directory(path, depth, show_progress=False),
+            self._show_scan_results,
+            self._scan_failed
+        )
+
+    def _run_in_background(self, work, on_done, on_error):
+        """Run work() on a worker thread, then on_done(result) or on_error(exc) on the Tk thread"""
+        # Widgets are only touched from the main thread, which polls for the result
+        self.scan_btn.state(["disabled"])
+        self.clean_btn.state(["disabled"])
+        self.busy_bar.start()
+
+        def worker():
+            try:
+                self.task_queue.put((on_done, work()))
+            except Exception as e:
+                self.task_queue.put((on_error, e))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, self._poll_task)
+
+    def _poll_task(self):
+        try:
+            callback, result = self.task_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_task)
+            return
+
+        self.busy_bar.stop()
+        self.scan_btn.state(["!disabled"])
+        self.clean_btn.state(["!disabled"])
+        callback(result)
+
+    def _scan_failed(self, error):
+        self.status_var.set("Scan failed")
+        messagebox.showerror("Error", f"Scan failed: {error}")
+
+    def _show_scan_results(self, result):
+        self.scan_results = result
         self.status_var.set("Scan complete")
 
         self.listbox.delete(0, tk.END)
         self.category_order = []
+        rows = []
         for category, files in self.scan_results.items():
             if not files:
                 continue
-            size = sum(s for _, s, _ in files)
-            text = f"{category} ({len(files)} files, {self.engine.format_size(size)})"
-            self.listbox.insert(tk.END, text)
+            size = files.total_size()
+            rows.append(f"{category} ({len(files)} files, {self.engine.format_size(size)})")
             self.category_order.append(category)
+        # One Tk call for all rows
+        if rows:
+            self.listbox.insert(tk.END, *rows)
 
     def clean(self):
         selection = self.listbox.curselection()
@@ -89,9 +138,8 @@ class MacSweepGUI:
         total_size = 0
         for idx in selection:
             category = self.category_order[idx]
-            for path, size, _ in self.scan_results[category]:
-                selected_files.append(path)
-                total_size += size
+            selected_files.extend(self.scan_results[category])
+            total_size += self.scan_results[category].total_size()
 
         confirm = messagebox.askyesno(
             "Confirm Cleanup",
@@ -100,16 +148,35 @@ class MacSweepGUI:
         if not confirm:
             return
 
+        # Grey out the rows being cleaned while the removal runs in the background
+        for idx in selection:
+            self.listbox.itemconfig(idx, fg="grey")
+        self.listbox.selection_clear(0, tk.END)
+        self.status_var.set("Cleaning...")
         self.engine.set_dry_run(self.dry_var.get())
-        files_removed, bytes_freed = self.engine.cleanup_files(selected_files)
+        self._run_in_background(
+            lambda: self.engine.cleanup_files(selected_files),
+            self._show_cleanup_results,
+            lambda error: self._cleanup_failed(selection, error)
+        )
+
+    def _show_cleanup_results(self, result):
+        files_removed, bytes_freed = result
         messagebox.showinfo(
             "MacSweep",
             f"Cleanup complete.\nFiles removed: {files_removed}\nSpace freed: {self.engine.format_size(bytes_freed)}"
         )
         self.scan_results = {}
+        self.category_order = []
         self.listbox.delete(0, tk.END)
         self.status_var.set("Ready")
 
+    def _cleanup_failed(self, selection, error):
+        for idx in selection:
+            self.listbox.itemconfig(idx, fg="")
+        self.status_var.set("Cleanup failed")
+        messagebox.showerror("Error", f"Cleanup failed: {error}")
+
 
 def main():
     root = tk.Tk()